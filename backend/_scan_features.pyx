@@ -0,0 +1,51 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Single-pass pixel statistics for scan_classifier, compiled to C.
+
+Optional accelerator — build in place with:
+
+    pip install cython
+    cythonize -i backend/_scan_features.pyx
+
+scan_classifier falls back to its Numba / NumPy paths when this module
+has not been built, so shipping without it is fine.
+"""
+
+import numpy as np
+
+from libc.math cimport sqrt
+
+
+def fused_stats(const unsigned char[:, ::1] img):
+    """
+    Histogram, mean, std, and dark (<50) / bright (>200) pixel counts of
+    a uint8 image, computed in one pass over the pixels with the GIL
+    released.
+    """
+    cdef Py_ssize_t h = img.shape[0]
+    cdef Py_ssize_t w = img.shape[1]
+    hist_arr = np.zeros(256, dtype=np.int64)
+    cdef long long[::1] hist = hist_arr
+    cdef double total = 0.0
+    cdef double total_sq = 0.0
+    cdef Py_ssize_t i, j
+    cdef unsigned char v
+    with nogil:
+        for i in range(h):
+            for j in range(w):
+                v = img[i, j]
+                hist[v] += 1
+                total += v
+                total_sq += <double> v * v
+    cdef double n = <double> (h * w)
+    cdef double mean = total / n
+    cdef double var = total_sq / n - mean * mean
+    if var < 0.0:
+        var = 0.0
+    cdef long long dark = 0
+    cdef long long bright = 0
+    for i in range(50):
+        dark += hist[i]
+    for i in range(201, 256):
+        bright += hist[i]
+    return hist_arr, mean, sqrt(var), dark, bright
@@ -0,0 +1,94 @@
+"""
+Concurrent ops probe for the model-registry endpoints.
+
+Hits the NVIDIA and Groq model lists in parallel so the ops check takes
+~max(latency) instead of the sum of two serial TLS handshakes. Uses
+httpx with HTTP/2 when installed (pip install httpx[http2]); otherwise
+falls back to pooled requests sessions on a thread pool.
+
+Run directly:  python -m backend.probe_models
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# httpx's http2=True raises at client construction unless the h2 extra
+# is installed, so only request HTTP/2 when it actually is.
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+load_dotenv()
+
+ENDPOINTS = [
+    ("NVIDIA", "https://integrate.api.nvidia.com/v1/models", "NVIDIA_API_KEY"),
+    ("Groq", "https://api.groq.com/openai/v1/models", "GROQ_API_KEY"),
+]
+
+TIMEOUT = 5
+
+
+async def probe(client, url: str, api_key: str):
+    """Fetch one endpoint, returning (status_code, body text)."""
+    response = await client.get(url, headers={"Authorization": f"Bearer {api_key}"})
+    return response.status_code, response.text
+
+
+async def _probe_all_async():
+    async with httpx.AsyncClient(http2=_HTTP2, timeout=TIMEOUT) as client:
+        tasks = [
+            probe(client, url, os.getenv(key_env) or "")
+            for _, url, key_env in ENDPOINTS
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _probe_one_sync(url: str, api_key: str):
+    response = requests.get(
+        url, headers={"Authorization": f"Bearer {api_key}"}, timeout=TIMEOUT
+    )
+    return response.status_code, response.text
+
+
+def _probe_all_threaded():
+    with ThreadPoolExecutor(max_workers=len(ENDPOINTS)) as pool:
+        futures = [
+            pool.submit(_probe_one_sync, url, os.getenv(key_env) or "")
+            for _, url, key_env in ENDPOINTS
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def main():
+    if httpx is not None:
+        results = asyncio.run(_probe_all_async())
+    else:
+        results = _probe_all_threaded()
+    for (name, url, _), result in zip(ENDPOINTS, results):
+        if isinstance(result, Exception):
+            print(f"{name}: error - {result}")
+        else:
+            status, text = result
+            detail = "" if status == 200 else f" - {text[:200]}"
+            print(f"{name}: HTTP {status}{detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,16 @@ PDF Report Generator Module
 Creates professional medical scan analysis reports in PDF format.
 """
 
+import io
 import os
+import queue
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from PIL import Image
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from fpdf.fonts import FontFace
 
 
 # ── Colour constants ──────────────────────────────────────────────
@@ -14,6 +21,34 @@ LIGHT_GREY_BG = (220, 220, 220)       # boxes / fills
 DARK_GREY_LINE = (130, 130, 130)       # lines / borders
 WHITE = (255, 255, 255)
 
+# Severity → accent colour, shared by finding cards and key-value rows.
+SEVERITY_COLORS = {
+    "high": (239, 68, 68),      # red
+    "medium": (251, 191, 36),   # amber
+    "low": (52, 211, 153),      # green
+}
+
+# Fixed layout widths (190mm usable on A4): description column next to the
+# 50mm region label, and recommendation text after the 5mm bullet.
+STRUCT_DESC_WIDTH = 190 - 50
+RECOMMENDATION_WIDTH = 190 - 5
+
+DISCLAIMER_TEXT = (
+    "This report has been generated by HealthGuard AI, an artificial intelligence-based "
+    "medical scan analysis system. The findings and predictions presented in this report "
+    "are AI-generated and should NOT be used as a sole basis for medical diagnosis or "
+    "treatment decisions.\n\n"
+    "This tool is designed to assist healthcare professionals by providing preliminary "
+    "analysis and highlighting potential areas of interest. All findings should be reviewed "
+    "and validated by qualified medical professionals.\n\n"
+    "The AI model uses deep learning techniques including DenseNet-121 architecture with "
+    "GradCAM visualization. While the model has been trained on medical imaging data, "
+    "it may produce false positives or miss findings. Always consult with a licensed "
+    "healthcare provider for proper diagnosis and treatment.\n\n"
+    "HealthGuard AI and its developers are not liable for any medical decisions made "
+    "based on the outputs of this system."
+)
+
 
 def sanitize_text(text: str) -> str:
     """
@@ -39,12 +74,74 @@ def sanitize_text(text: str) -> str:
     return text.encode('latin-1', 'replace').decode('latin-1')
 
 
+# Static strings rendered on every report – pre-warmed into the width cache
+# as (style, size_pt, text) so repeated layout passes never re-measure them.
+_COMMON_STRINGS = (
+    ("B", 11, "HEALTHGUARD AI"),
+    ("", 8, "Medical Scan Analysis Report"),
+    ("B", 8, "Parameter"),
+    ("B", 8, "Result"),
+    ("B", 8, "Normal Range"),
+    ("B", 8, "Status"),
+    ("I", 7, "DISCLAIMER: AI-assisted analysis. Not a substitute for professional medical diagnosis."),
+)
+
+
 class MedicalReportPDF(FPDF):
     """Custom PDF class for medical reports."""
 
     def __init__(self):
         super().__init__()
         self.set_auto_page_break(auto=True, margin=25)
+        # Memoized string widths: (family, style, size_pt, text) -> width.
+        # cell/multi_cell re-measure the same labels dozens of times per
+        # report; the font metric lookup is pure-Python and dominates
+        # header/footer/table-heavy pages.
+        self._sw_cache = {}
+        # Last colour set through set_text_color, for the state guard below.
+        self._tc_args = None
+        self._tc_obj = None
+
+    # ── State-change guards ───────────────────────────────────────
+    # The report re-issues the same font/colour before nearly every cell;
+    # skip the underlying call (style parsing, colour object allocation)
+    # when the requested state is already current.
+    def set_font(self, family=None, style="", size=0):
+        if (family is not None and size
+                and self.font_family == family.lower()
+                and self.font_style == style
+                and self.font_size_pt == size
+                and not self.underline and not self.strikethrough):
+            return
+        super().set_font(family, style, size)
+
+    def set_text_color(self, r, g=-1, b=-1):
+        # `self.text_color is self._tc_obj` catches fpdf internals (table
+        # FontFace styling) restoring the colour behind our back.
+        if (r, g, b) == self._tc_args and self.text_color is self._tc_obj:
+            return
+        super().set_text_color(r, g, b)
+        self._tc_args = (r, g, b)
+        self._tc_obj = self.text_color
+
+    def get_string_width(self, s, normalized=False, markdown=False):
+        if markdown:
+            return super().get_string_width(s, normalized, markdown)
+        key = (self.font_family, self.font_style, self.font_size_pt, normalized, s)
+        width = self._sw_cache.get(key)
+        if width is None:
+            width = super().get_string_width(s, normalized, markdown)
+            self._sw_cache[key] = width
+        return width
+
+    def warm_string_width_cache(self):
+        """Pre-measure the fixed labels so the first page renders from cache."""
+        family, style, size = self.font_family, self.font_style, self.font_size_pt
+        for warm_style, warm_size, text in _COMMON_STRINGS:
+            self.set_font("Helvetica", warm_style, warm_size)
+            self.get_string_width(text)
+        if family:
+            self.set_font(family, style, size)
 
     # ── Header ────────────────────────────────────────────────────
     def header(self):
@@ -55,11 +152,11 @@ class MedicalReportPDF(FPDF):
         self.set_font("Helvetica", "B", 11)
         self.set_text_color(*BLACK)
         self.set_y(4)
-        self.cell(0, 10, "HEALTHGUARD AI", ln=False, align="L")
+        self.cell(0, 10, "HEALTHGUARD AI", align="L")
 
         self.set_font("Helvetica", "", 8)
         self.set_text_color(*BLACK)
-        self.cell(0, 10, "Medical Scan Analysis Report", ln=True, align="R")
+        self.cell(0, 10, "Medical Scan Analysis Report", align="R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
         self.ln(8)
 
@@ -72,16 +169,16 @@ class MedicalReportPDF(FPDF):
 
         self.set_font("Helvetica", "I", 7)
         self.set_text_color(*BLACK)
-        self.cell(0, 8, f"Page {self.page_no()}/{{nb}}", align="L", ln=False)
+        self.cell(0, 8, f"Page {self.page_no()}/{{nb}}", align="L")
         self.cell(0, 8,
                   "DISCLAIMER: AI-assisted analysis. Not a substitute for professional medical diagnosis.",
-                  align="R", ln=True)
+                  align="R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # ── Section title ─────────────────────────────────────────────
     def add_section_title(self, title):
         self.set_font("Helvetica", "B", 13)
         self.set_text_color(*BLACK)
-        self.cell(0, 10, sanitize_text(title), ln=True)
+        self.cell(0, 10, sanitize_text(title), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         self.set_draw_color(*DARK_GREY_LINE)
         self.line(10, self.get_y(), 80, self.get_y())
         self.ln(4)
@@ -90,14 +187,14 @@ class MedicalReportPDF(FPDF):
     def add_key_value(self, key, value, severity=None):
         self.set_font("Helvetica", "B", 9)
         self.set_text_color(*BLACK)
-        self.cell(55, 7, sanitize_text(key) + ":", ln=False)
+        self.cell(55, 7, sanitize_text(key) + ":")
 
         self.set_font("Helvetica", "", 9)
-        self.set_text_color(*BLACK)
-        self.cell(0, 7, sanitize_text(str(value)), ln=True)
+        self.set_text_color(*SEVERITY_COLORS.get(severity, BLACK))
+        self.cell(0, 7, sanitize_text(str(value)), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # ── Finding card (auto-sized) ─────────────────────────────────
-    def add_finding_card(self, finding: dict, index: int):
+    def add_finding_card(self, index: int, name: str, confidence, desc: str, severity: str):
         card_x = 10
         card_w = 190
         content_margin = 6    # left padding inside card
@@ -108,10 +205,6 @@ class MedicalReportPDF(FPDF):
         line_h_desc = 5
 
         # Description height via NbLines helper
-        desc = sanitize_text(finding.get("description", ""))
-        if len(desc) > 300:
-            desc = desc[:297] + "..."
-
         self.set_font("Helvetica", "", 8)
         desc_lines = self.multi_cell(inner_w, line_h_desc, desc, dry_run=True, output="LINES") or [""]
         desc_height = len(desc_lines) * line_h_desc
@@ -129,26 +222,19 @@ class MedicalReportPDF(FPDF):
         self.rect(card_x, y_start, card_w, card_h, 'F')
 
         # Severity indicator stripe
-        severity = finding.get("severity", "medium")
-        if severity == "high":
-            self.set_fill_color(239, 68, 68)
-        elif severity == "medium":
-            self.set_fill_color(251, 191, 36)
-        else:
-            self.set_fill_color(52, 211, 153)
+        self.set_fill_color(*SEVERITY_COLORS.get(severity, SEVERITY_COLORS["low"]))
         self.rect(card_x, y_start, 3, card_h, 'F')
 
         # Finding name
         self.set_xy(card_x + content_margin, y_start + 3)
         self.set_font("Helvetica", "B", 10)
         self.set_text_color(*BLACK)
-        self.cell(120, line_h_title, f"{index}. {sanitize_text(finding['finding'])}", ln=False)
+        self.cell(120, line_h_title, f"{index}. {name}")
 
         # Confidence badge
         self.set_font("Helvetica", "B", 9)
         self.set_text_color(*BLACK)
-        conf = finding["confidence"]
-        self.cell(0, line_h_title, f"{conf}% confidence", ln=True, align="R")
+        self.cell(0, line_h_title, f"{confidence}% confidence", align="R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
         # Description
         self.set_x(card_x + content_margin)
@@ -159,6 +245,223 @@ class MedicalReportPDF(FPDF):
         # Move cursor below card
         self.set_y(y_start + card_h + 4)
 
+    # ── Recycling support ─────────────────────────────────────────
+    def reset(self):
+        """Return the instance to a fresh-document state, keeping warm caches."""
+        sw_cache = self._sw_cache
+        self.__init__()
+        if len(sw_cache) <= 4096:  # reuse measured widths, but bound memory
+            self._sw_cache = sw_cache
+
+
+# Font variants used across the report, warmed once per pooled instance.
+_REPORT_FONTS = (
+    ("B", 8), ("B", 9), ("B", 10), ("B", 11), ("B", 13), ("B", 18), ("B", 20),
+    ("", 8), ("", 9),
+    ("I", 7), ("I", 8), ("I", 9),
+)
+
+
+class PDFPool:
+    """
+    Bounded LIFO pool of pre-initialized MedicalReportPDF instances.
+    Building an FPDF object loads font metric tables and a pile of internal
+    dicts; reusing instances across requests keeps those (and the string-width
+    cache) warm instead of rebuilding them per report.
+    """
+
+    def __init__(self, size: int = 4):
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._make())
+
+    @staticmethod
+    def _make():
+        pdf = MedicalReportPDF()
+        for style, size in _REPORT_FONTS:
+            pdf.set_font("Helvetica", style, size)
+        return pdf
+
+    def acquire(self) -> "MedicalReportPDF":
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            # Pool exhausted under concurrent load – hand out a fresh one.
+            return self._make()
+
+    def release(self, pdf: "MedicalReportPDF"):
+        pdf.reset()
+        try:
+            self._pool.put_nowait(pdf)
+        except queue.Full:
+            pass  # extra instance created under load; let it be collected
+
+
+# Built on first report rather than at import, so merely importing this
+# module (or booting a worker that never renders a PDF) stays cheap.
+_PDF_POOL = None
+
+
+def _pdf_pool() -> PDFPool:
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        _PDF_POOL = PDFPool()
+    return _PDF_POOL
+
+
+# ── Date formatting ───────────────────────────────────────────────
+# Inlined f-string equivalents of the strftime patterns used below;
+# avoids dispatching through libc's strftime and its locale machinery
+# on every report.
+
+_MONTHS = ("January", "February", "March", "April", "May", "June",
+           "July", "August", "September", "October", "November", "December")
+
+
+def _format_generated_on(now) -> str:
+    """Equivalent of strftime('%B %d, %Y at %I:%M %p')."""
+    hour12 = (now.hour - 1) % 12 + 1
+    meridiem = "PM" if now.hour >= 12 else "AM"
+    return (f"{_MONTHS[now.month - 1]} {now.day:02d}, {now.year} "
+            f"at {hour12:02d}:{now.minute:02d} {meridiem}")
+
+
+def _format_timestamp(now) -> str:
+    """Equivalent of strftime('%Y-%m-%d %H:%M:%S')."""
+    return (f"{now.year}-{now.month:02d}-{now.day:02d} "
+            f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}")
+
+
+def _format_compact_stamp(now) -> str:
+    """Equivalent of strftime('%Y%m%d_%H%M%S'), used in report filenames."""
+    return (f"{now.year}{now.month:02d}{now.day:02d}_"
+            f"{now.hour:02d}{now.minute:02d}{now.second:02d}")
+
+
+# ── Row pre-passes ────────────────────────────────────────────────
+# Materialize each detailed-report section as fixed-shape tuples before
+# touching the PDF, so the emission loops do positional unpacking only —
+# no dict lookups or sanitizing inside the hot rendering path.
+
+def _prep_structures(structures: dict) -> tuple:
+    return tuple(
+        (sanitize_text(region) + ":", sanitize_text(description))
+        for region, description in structures.items()
+    )
+
+
+def _prep_metrics(metrics: list) -> tuple:
+    return tuple(
+        (
+            sanitize_text(m['parameter']),
+            sanitize_text(str(m['result'])),
+            sanitize_text(str(m['normal'])),
+            sanitize_text(m['status']),
+        )
+        for m in metrics
+    )
+
+
+def _prep_risks(risks: list) -> tuple:
+    return tuple(
+        (
+            sanitize_text(r['pathology']),
+            f"Probability: {sanitize_text(str(r['probability']))}",
+            f"Risk: {sanitize_text(r['risk_category'])}",
+        )
+        for r in risks
+    )
+
+
+def _prep_recommendations(recommendations: list) -> tuple:
+    return tuple(sanitize_text(rec) for rec in recommendations)
+
+
+def _shorten(text: str, limit: int = 300) -> str:
+    """Truncate with an ellipsis; returns the original string untouched
+    (no copy) when it already fits."""
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _prep_findings(findings: list) -> tuple:
+    return tuple(
+        (
+            index,
+            sanitize_text(finding["finding"]),
+            finding["confidence"],
+            _shorten(sanitize_text(finding.get("description", ""))),
+            finding.get("severity", "medium"),
+        )
+        for index, finding in enumerate(findings, 1)
+    )
+
+
+@lru_cache(maxsize=1)
+def _disclaimer_lines() -> tuple:
+    """
+    Wrap DISCLAIMER_TEXT once for the fixed font/width it always renders
+    at. The disclaimer is static, so re-running fpdf's line-breaking
+    (~100 string-width lookups) on every report is pure waste; later
+    reports emit the pre-split lines with plain cell() calls.
+    """
+    pool = _pdf_pool()
+    pdf = pool.acquire()
+    pdf.add_page()
+    pdf.set_font("Helvetica", "", 9)
+    lines = pdf.multi_cell(0, 5, DISCLAIMER_TEXT, dry_run=True, output="LINES")
+    pool.release(pdf)
+    return tuple(lines)
+
+
+def _resolve_image(images_dir: str, name: str):
+    """
+    Resolve a result image with a single stat() call.
+    Returns (path, mtime) when the file exists, else None — replacing the
+    separate exists() and getmtime() round-trips per image.
+    """
+    if not name:
+        return None
+    path = os.path.join(images_dir, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return path, st.st_mtime
+
+
+# Images are placed at w=150mm; 1200px across that span is ~200 DPI in
+# print, so anything larger only feeds extra pixels to the deflate encoder.
+_IMAGE_TARGET_PX = 1200
+
+
+@lru_cache(maxsize=16)
+def _decoded_image(path: str, mtime: float) -> Image.Image:
+    """
+    Decode and downsample once per (path, mtime). When the heatmap and
+    annotated overlay reference the same underlying file (common for
+    GradCAM pipelines), a single PNG decode and LANCZOS resize serves
+    both embeds.
+    """
+    im = Image.open(path).convert("RGB")
+    if max(im.size) > _IMAGE_TARGET_PX:
+        im.thumbnail((_IMAGE_TARGET_PX, _IMAGE_TARGET_PX), Image.LANCZOS)
+    return im
+
+
+@lru_cache(maxsize=64)
+def _cached_image(path: str, mtime: float) -> bytes:
+    """
+    JPEG-compress the shared decoded image once per (path, mtime).
+    GradCAM heatmaps come in as PNG at native scan resolution; resized to
+    print DPI and stored as JPEG quality 85 they are visually identical
+    in the report, much smaller, and only paid for on the first embed of
+    a given file. fpdf2 embeds the JPEG stream as-is (DCTDecode), so
+    repeat embeds never re-encode pixels.
+    """
+    buf = io.BytesIO()
+    _decoded_image(path, mtime).save(buf, "JPEG", quality=85, optimize=True)
+    return buf.getvalue()
+
 
 def generate_report(
     scan_type_result: dict,
@@ -172,9 +475,12 @@ def generate_report(
     Generate a comprehensive professional PDF report.
     Returns the filename of the generated PDF.
     """
-    pdf = MedicalReportPDF()
-    pdf.alias_nb_pages()
+    # Note: on an exception the instance is simply dropped; the pool
+    # replaces it lazily on the next acquire().
+    pool = _pdf_pool()
+    pdf = pool.acquire()
     pdf.add_page()
+    pdf.warm_string_width_cache()
 
     now = datetime.datetime.now()
 
@@ -183,7 +489,7 @@ def generate_report(
         header = detailed_report['header']
         pdf.set_font("Helvetica", "B", 18)
         pdf.set_text_color(*BLACK)
-        pdf.cell(0, 10, "Radiology Analysis Report", ln=True, align="C")
+        pdf.cell(0, 10, "Radiology Analysis Report", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(5)
 
         pdf.add_section_title("Patient & Scan Information")
@@ -208,54 +514,51 @@ def generate_report(
         pdf.add_section_title("2. AI Structural Analysis")
         pdf.set_font("Helvetica", "", 9)
         pdf.set_text_color(*BLACK)
-        structures = detailed_report.get('structures', {})
-        for region, description in structures.items():
+        for region_label, description in _prep_structures(detailed_report.get('structures', {})):
             pdf.set_font("Helvetica", "B", 9)
             pdf.set_text_color(*BLACK)
-            pdf.cell(50, 6, sanitize_text(region) + ":", ln=False)
+            pdf.cell(50, 6, region_label)
 
             pdf.set_font("Helvetica", "", 9)
             pdf.set_text_color(*BLACK)
-            available_width = 190 - 50
-
-            pdf.multi_cell(available_width, 6, sanitize_text(description))
+            pdf.multi_cell(STRUCT_DESC_WIDTH, 6, description)
             pdf.ln(1)
         pdf.ln(4)
 
         # --- 3. Quantitative Metrics ---
         pdf.add_section_title("3. Quantitative Metrics")
 
-        # Table Header – light grey background
-        pdf.set_fill_color(*LIGHT_GREY_BG)
-        pdf.set_font("Helvetica", "B", 8)
-        pdf.set_text_color(*BLACK)
-        pdf.cell(50, 8, "Parameter", 1, 0, 'L', True)
-        pdf.cell(30, 8, "Result", 1, 0, 'C', True)
-        pdf.cell(40, 8, "Normal Range", 1, 0, 'C', True)
-        pdf.cell(30, 8, "Status", 1, 1, 'C', True)
-
-        # Table Rows
+        # One batched table() call – fpdf2 coalesces the border/fill ops
+        # per row instead of emitting four independent cell() calls each.
         pdf.set_font("Helvetica", "", 8)
         pdf.set_text_color(*BLACK)
-        for metric in detailed_report.get('metrics', []):
-            pdf.cell(50, 8, sanitize_text(metric['parameter']), 1, 0, 'L')
-            pdf.cell(30, 8, sanitize_text(str(metric['result'])), 1, 0, 'C')
-            pdf.cell(40, 8, sanitize_text(str(metric['normal'])), 1, 0, 'C')
-
-            pdf.set_text_color(*BLACK)
-            pdf.cell(30, 8, sanitize_text(metric['status']), 1, 1, 'C')
-            pdf.set_text_color(*BLACK)
+        with pdf.table(
+            width=150,
+            align="LEFT",
+            col_widths=(50, 30, 40, 30),
+            text_align=("LEFT", "CENTER", "CENTER", "CENTER"),
+            line_height=8,
+            headings_style=FontFace(emphasis="BOLD", fill_color=LIGHT_GREY_BG),
+        ) as table:
+            table.row(("Parameter", "Result", "Normal Range", "Status"))
+            for parameter, result, normal, status in \
+                    _prep_metrics(detailed_report.get('metrics', [])):
+                row = table.row()
+                row.cell(parameter)
+                row.cell(result)
+                row.cell(normal)
+                row.cell(status)
         pdf.ln(6)
 
         # --- 4. Risk Stratification ---
         pdf.add_section_title("4. AI Risk Stratification")
-        for risk in detailed_report.get('risks', []):
+        for pathology, probability, risk_category in _prep_risks(detailed_report.get('risks', [])):
             pdf.set_font("Helvetica", "B", 9)
             pdf.set_text_color(*BLACK)
-            pdf.cell(60, 6, sanitize_text(risk['pathology']), ln=False)
+            pdf.cell(60, 6, pathology)
             pdf.set_font("Helvetica", "", 9)
-            pdf.cell(40, 6, f"Probability: {sanitize_text(str(risk['probability']))}", ln=False)
-            pdf.cell(0, 6, f"Risk: {sanitize_text(risk['risk_category'])}", ln=True)
+            pdf.cell(40, 6, probability)
+            pdf.cell(0, 6, risk_category, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(6)
 
         # --- 5. Clinical Interpretation ---
@@ -268,18 +571,17 @@ def generate_report(
         # --- 6. Recommendations ---
         pdf.add_section_title("6. Recommendations")
         pdf.set_text_color(*BLACK)
-        for rec in detailed_report.get('recommendations', []):
+        for rec in _prep_recommendations(detailed_report.get('recommendations', [])):
             pdf.set_font("Helvetica", "", 9)
-            pdf.cell(5, 5, "-", ln=False)
-            available_width = 190 - 5
-            pdf.multi_cell(available_width, 5, sanitize_text(rec))
+            pdf.cell(5, 5, "-")
+            pdf.multi_cell(RECOMMENDATION_WIDTH, 5, rec)
         pdf.ln(6)
 
         # --- 7. AI Confidence ---
         pdf.add_section_title("7. AI Confidence Statement")
         pdf.set_font("Helvetica", "I", 9)
         pdf.set_text_color(*BLACK)
-        pdf.cell(0, 6, sanitize_text(str(detailed_report.get('confidence', ''))), ln=True)
+        pdf.cell(0, 6, sanitize_text(str(detailed_report.get('confidence', ''))), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(4)
 
     else:
@@ -287,10 +589,10 @@ def generate_report(
         # --- Report Title ---
         pdf.set_font("Helvetica", "B", 20)
         pdf.set_text_color(*BLACK)
-        pdf.cell(0, 12, "Scan Analysis Report", ln=True, align="C")
+        pdf.cell(0, 12, "Scan Analysis Report", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.set_font("Helvetica", "", 9)
         pdf.set_text_color(*BLACK)
-        pdf.cell(0, 6, f"Generated on {now.strftime('%B %d, %Y at %I:%M %p')}", ln=True, align="C")
+        pdf.cell(0, 6, f"Generated on {_format_generated_on(now)}", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(8)
 
         # --- Patient / File Info ---
@@ -299,7 +601,7 @@ def generate_report(
         pdf.add_key_value("Scan Type", scan_type_result.get("scan_type", "Unknown"))
         pdf.add_key_value("Type Confidence", f"{scan_type_result.get('confidence', 0)}%")
         pdf.add_key_value("Resolution", scan_type_result.get("features", {}).get("resolution", "N/A"))
-        pdf.add_key_value("Analysis Date", now.strftime("%Y-%m-%d %H:%M:%S"))
+        pdf.add_key_value("Analysis Date", _format_timestamp(now))
         pdf.add_key_value("Model", analysis_result.get("model_info", {}).get("name", "HealthGuard AI"))
         pdf.ln(4)
 
@@ -320,79 +622,122 @@ def generate_report(
 
         # --- Findings ---
         pdf.add_section_title("Detailed Findings")
-        findings = analysis_result.get("findings", [])
-        for i, finding in enumerate(findings, 1):
-            pdf.add_finding_card(finding, i)
+        for index, name, confidence, desc, severity in \
+                _prep_findings(analysis_result.get("findings", [])):
+            pdf.add_finding_card(index, name, confidence, desc, severity)
 
     # --- Images (Common) ---
-    heatmap_file = analysis_result.get("heatmap_path")
-    annotated_file = analysis_result.get("annotated_path")
+    heatmap = _resolve_image(images_dir, analysis_result.get("heatmap_path"))
+    annotated = _resolve_image(images_dir, analysis_result.get("annotated_path"))
 
-    if heatmap_file or annotated_file:
+    if heatmap or annotated:
         pdf.add_page()
         pdf.add_section_title("Visual Analysis")
 
         # Heatmap
-        if heatmap_file:
-            heatmap_full = os.path.join(images_dir, heatmap_file)
-            if os.path.exists(heatmap_full):
-                pdf.set_font("Helvetica", "B", 10)
-                pdf.set_text_color(*BLACK)
-                pdf.cell(0, 8, "GradCAM Heatmap Analysis", ln=True)
-                pdf.set_font("Helvetica", "", 8)
-                pdf.set_text_color(*BLACK)
-                pdf.cell(0, 5, "Warmer colors indicate regions most relevant to the AI prediction.", ln=True)
-                pdf.ln(2)
-                try:
-                    pdf.image(heatmap_full, x=30, w=150)
-                except Exception:
-                    pdf.cell(0, 8, "[Heatmap image could not be loaded]", ln=True)
-                pdf.ln(6)
+        if heatmap:
+            heatmap_full, heatmap_mtime = heatmap
+            pdf.set_font("Helvetica", "B", 10)
+            pdf.set_text_color(*BLACK)
+            pdf.cell(0, 8, "GradCAM Heatmap Analysis", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.set_font("Helvetica", "", 8)
+            pdf.set_text_color(*BLACK)
+            pdf.cell(0, 5, "Warmer colors indicate regions most relevant to the AI prediction.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.ln(2)
+            try:
+                pdf.image(io.BytesIO(_cached_image(heatmap_full, heatmap_mtime)),
+                          x=30, w=150)
+            except Exception:
+                pdf.cell(0, 8, "[Heatmap image could not be loaded]", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.ln(6)
 
         # Annotated
-        if annotated_file:
-            annotated_full = os.path.join(images_dir, annotated_file)
-            if os.path.exists(annotated_full):
-                pdf.set_font("Helvetica", "B", 10)
-                pdf.set_text_color(*BLACK)
-                pdf.cell(0, 8, "Annotated Regions of Interest", ln=True)
-                pdf.set_font("Helvetica", "", 8)
-                pdf.set_text_color(*BLACK)
-                pdf.cell(0, 5,
-                        "Green boxes and yellow contours highlight AI-identified regions of interest.",
-                        ln=True)
-                pdf.ln(2)
-                try:
-                    pdf.image(annotated_full, x=30, w=150)
-                except Exception:
-                    pdf.cell(0, 8, "[Annotated image could not be loaded]", ln=True)
-                pdf.ln(6)
+        if annotated:
+            annotated_full, annotated_mtime = annotated
+            pdf.set_font("Helvetica", "B", 10)
+            pdf.set_text_color(*BLACK)
+            pdf.cell(0, 8, "Annotated Regions of Interest", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.set_font("Helvetica", "", 8)
+            pdf.set_text_color(*BLACK)
+            pdf.cell(0, 5,
+                    "Green boxes and yellow contours highlight AI-identified regions of interest.",
+                    new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.ln(2)
+            try:
+                pdf.image(io.BytesIO(_cached_image(annotated_full, annotated_mtime)),
+                          x=30, w=150)
+            except Exception:
+                pdf.cell(0, 8, "[Annotated image could not be loaded]", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.ln(6)
 
     # --- Disclaimer ---
     pdf.add_page()
     pdf.add_section_title("Important Disclaimer")
     pdf.set_font("Helvetica", "", 9)
     pdf.set_text_color(*BLACK)
-    disclaimer = (
-        "This report has been generated by HealthGuard AI, an artificial intelligence-based "
-        "medical scan analysis system. The findings and predictions presented in this report "
-        "are AI-generated and should NOT be used as a sole basis for medical diagnosis or "
-        "treatment decisions.\n\n"
-        "This tool is designed to assist healthcare professionals by providing preliminary "
-        "analysis and highlighting potential areas of interest. All findings should be reviewed "
-        "and validated by qualified medical professionals.\n\n"
-        "The AI model uses deep learning techniques including DenseNet-121 architecture with "
-        "GradCAM visualization. While the model has been trained on medical imaging data, "
-        "it may produce false positives or miss findings. Always consult with a licensed "
-        "healthcare provider for proper diagnosis and treatment.\n\n"
-        "HealthGuard AI and its developers are not liable for any medical decisions made "
-        "based on the outputs of this system."
-    )
-    pdf.multi_cell(0, 5, disclaimer)
+    for line in _disclaimer_lines():
+        pdf.cell(0, 5, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # Save PDF
-    report_filename = f"HealthGuard_Report_{now.strftime('%Y%m%d_%H%M%S')}.pdf"
+    report_filename = f"HealthGuard_Report_{_format_compact_stamp(now)}.pdf"
     report_path = os.path.join(output_dir, report_filename)
-    pdf.output(report_path)
+
+    # Render in memory and flush with a single write() instead of letting
+    # fpdf stream many small buffered chunks through stdio.
+    pdf_bytes = bytes(pdf.output())
+    fd = os.open(report_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, pdf_bytes)
+    finally:
+        os.close(fd)
+
+    pool.release(pdf)
 
     return report_filename
+
+
+# ── Concurrent generation ─────────────────────────────────────────
+_EXECUTOR = None
+
+
+def _init_worker():
+    # Runs once per worker process: importing this module already built the
+    # per-process PDF pool; warming the disclaimer cache touches the fonts
+    # and line-breaking paths so the first real report pays nothing extra.
+    _disclaimer_lines()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_worker,
+        )
+    return _EXECUTOR
+
+
+def generate_report_async(
+    scan_type_result: dict,
+    analysis_result: dict,
+    original_filename: str,
+    output_dir: str,
+    images_dir: str,
+    detailed_report: dict = None,
+):
+    """
+    Run generate_report on a warm worker process pool.
+    PDF generation is CPU-bound pure Python and never releases the GIL, so
+    concurrent requests serialize if rendered in the server process; the
+    pool lets a multi-core host build several reports at once.
+    Returns a concurrent.futures.Future resolving to the report filename.
+    """
+    return _get_executor().submit(
+        generate_report,
+        scan_type_result,
+        analysis_result,
+        original_filename,
+        output_dir,
+        images_dir,
+        detailed_report,
+    )
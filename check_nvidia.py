@@ -1,29 +1,41 @@
 
 import os
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Placeholder for user to fill
-api_key = os.getenv("NVIDIA_API_KEY") 
+api_key = os.getenv("NVIDIA_API_KEY")
 
 print(f"Checking NVIDIA API... Key present: {bool(api_key)}")
 
-# Standard NVIDIA NIM endpoint for list models is not always 'v1/models', 
+# Standard NVIDIA NIM endpoint for list models is not always 'v1/models',
 # but let's try standard OpenAI format which they often support.
-url = "https://integrate.api.nvidia.com/v1/models" 
+url = "https://integrate.api.nvidia.com/v1/models"
 # Or sometimes "https://api.nvidia.com/v1/models" depending on the service
 # build.nvidia.com usually gives a specific invoke URL per model.
 # Let's try to list generic models if possible, or just test a known one.
 
-headers = {
+# Shared keep-alive session: reuses the TCP+TLS connection across calls
+# instead of handshaking per request.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
+_SESSION.headers.update({
     "Authorization": f"Bearer {api_key}",
     "Content-Type": "application/json"
-}
+})
 
 try:
-    response = requests.get(url, headers=headers, timeout=5)
+    response = _SESSION.get(url, timeout=5)
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         print("Models found:", response.json())
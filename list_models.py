@@ -2,8 +2,14 @@
 import os
 import requests
 import json
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
 
+try:
+    import ijson  # optional: stream-parse large model catalogs
+except ImportError:
+    ijson = None
+
 load_dotenv()
 
 api_key = os.getenv("GROQ_API_KEY")
@@ -12,20 +18,38 @@ if not api_key:
     exit(1)
 
 url = "https://api.groq.com/openai/v1/models"
-headers = {
+
+# Shared keep-alive session: reuses the TCP+TLS connection across calls
+# instead of handshaking per request.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
+_SESSION.headers.update({
     "Authorization": f"Bearer {api_key}",
     "Content-Type": "application/json"
-}
+})
 
 try:
-    response = requests.get(url, headers=headers)
+    response = _SESSION.get(url, timeout=5, stream=True)
     if response.status_code == 200:
-        models = response.json()['data']
+        if ijson is not None:
+            # Pull just the ids out of the response stream instead of
+            # deserializing the whole catalog into dicts.
+            response.raw.decode_content = True
+            model_ids = list(ijson.items(response.raw, 'data.item.id'))
+        else:
+            model_ids = [model['id'] for model in response.json()['data']]
         with open("models_list.txt", "w", encoding="utf-8") as f:
-            f.write(f"Found {len(models)} models.\n")
+            f.write(f"Found {len(model_ids)} models.\n")
             f.write("-" * 40 + "\n")
-            for model in models:
-                f.write(model['id'] + "\n")
+            for model_id in model_ids:
+                f.write(model_id + "\n")
         print("Models written to models_list.txt")
     else:
         print(f"Error fetching models: {response.status_code} - {response.text}")
@@ -19,9 +19,15 @@ from PIL import Image
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 
-from backend.scan_classifier import classify_scan_type
+from backend.scan_classifier import classify_scan_type, warm_up as warm_up_classifier
 from backend.analyzer import MedicalImageAnalyzer, MEDICAL_FINDINGS
-from backend.report_generator import generate_report
+
+
+def generate_report(*args, **kwargs):
+    """Lazy wrapper: importing the PDF stack (fpdf) costs ~200ms, so defer
+    it to the first report instead of paying it at server boot."""
+    from backend.report_generator import generate_report as _generate_report
+    return _generate_report(*args, **kwargs)
 
 # ---------- Configuration ----------
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), "uploads")
@@ -67,6 +73,7 @@ def handle_server_error(e):
 # ---------- Load ML Model ----------
 print("[HealthGuard AI] Loading ML models...")
 analyzer = MedicalImageAnalyzer()
+warm_up_classifier()  # prime cv2/Numba hot paths so the first upload isn't slow
 print("[HealthGuard AI] Models loaded and ready!")
 
 # ---------- Session storage for re-analysis ----------